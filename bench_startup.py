@@ -0,0 +1,52 @@
+import sys
+import time
+import subprocess
+
+# Import-time guard for signalsniper.py: importing the module must stay cheap
+# and must not drag in the heavy scraping / trading stack.
+HEAVY_MODULES = ["pandas", "yfinance", "bs4", "alpaca_trade_api", "supabase", "requests"]
+MAX_IMPORT_SECONDS = 0.5
+RUNS = 5
+
+PROBE = (
+    "import sys, time\n"
+    "t0 = time.perf_counter()\n"
+    "import signalsniper\n"
+    "elapsed = time.perf_counter() - t0\n"
+    "loaded = [m for m in {heavy!r} if m in sys.modules]\n"
+    "print(elapsed)\n"
+    "print(','.join(loaded))\n"
+)
+
+def measure_import():
+    """Import signalsniper in a fresh interpreter, return (seconds, heavy modules loaded)"""
+    code = PROBE.format(heavy=HEAVY_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    elapsed, loaded = (out.stdout.strip().splitlines() + [""])[:2]
+    return float(elapsed), [m for m in loaded.split(",") if m]
+
+def run_benchmark():
+    timings = []
+    loaded = []
+    for _ in range(RUNS):
+        elapsed, loaded = measure_import()
+        timings.append(elapsed)
+    best = min(timings)
+    print(f"⏱️ import signalsniper: best {best * 1000:.1f} ms over {RUNS} runs")
+
+    failures = []
+    if loaded:
+        failures.append(f"heavy modules imported at startup: {', '.join(loaded)}")
+    if best > MAX_IMPORT_SECONDS:
+        failures.append(f"import took {best:.3f}s (budget {MAX_IMPORT_SECONDS}s)")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Startup within budget")
+    return not failures
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    ok = run_benchmark()
+    print(f"Done in {time.perf_counter() - start:.2f}s")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,59 @@
+import sys
+import time
+import random
+from triggers import TriggerEngine, Rule
+
+# Replay a synthetic quote / signal stream against thousands of trigger rules
+# and report per-event matching latency.
+RULES = 5000
+EVENTS = 50000
+TICKERS = [f"T{i:03d}" for i in range(200)]
+SECTORS = ["biotech", "technology", "energy", "squeeze_candidate", "reddit_hype"]
+MAX_MICROSECONDS = 50  # Per-event budget (mean)
+
+def build_engine(rng):
+    engine = TriggerEngine()
+    for _ in range(RULES):
+        kind = rng.random()
+        if kind < 0.4:
+            engine.add(Rule("price", rng.choice(["crosses_above", "crosses_below"]),
+                            round(rng.uniform(10, 200), 2), ticker=rng.choice(TICKERS)))
+        elif kind < 0.7:
+            engine.add(Rule("price", rng.choice([">=", "<="]), round(rng.uniform(10, 200), 2),
+                            ticker=rng.choice(TICKERS)))
+        else:
+            engine.add(Rule("signal_score", ">=", rng.randint(60, 100),
+                            where={"sector": rng.choice(SECTORS)}))
+    return engine
+
+def replay(engine, rng):
+    prices = {t: rng.uniform(10, 200) for t in TICKERS}
+    events = []
+    for _ in range(EVENTS):
+        ticker = rng.choice(TICKERS)
+        if rng.random() < 0.8:
+            prices[ticker] *= 1 + rng.gauss(0, 0.01)
+            events.append({"ticker": ticker, "price": prices[ticker]})
+        else:
+            events.append({"ticker": ticker, "signal_score": rng.randint(0, 100),
+                           "sector": rng.choice(SECTORS)})
+    fired = 0
+    start = time.perf_counter()
+    for event in events:
+        fired += len(engine.evaluate(event))
+    return time.perf_counter() - start, fired
+
+def run_benchmark():
+    rng = random.Random(42)
+    engine = build_engine(rng)
+    elapsed, fired = replay(engine, rng)
+    per_event = elapsed / EVENTS * 1e6
+    print(f"⏱️ {EVENTS} events x {len(engine)} rules: {per_event:.1f} µs/event, {fired} triggers fired")
+    if per_event > MAX_MICROSECONDS:
+        print(f"❌ Over budget ({MAX_MICROSECONDS} µs/event)")
+        return False
+    print("✅ Trigger matching within budget")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark() else 1)
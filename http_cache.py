@@ -0,0 +1,235 @@
+import os
+import gzip
+import json
+import time
+import hashlib
+import threading
+import requests
+
+# Disk-backed HTTP response cache used by modular_scraper.safe_get.
+# Modes (SIGNALSNIPER_HTTP_CACHE):
+#   off    - plain fetch, nothing stored
+#   cache  - honor Cache-Control max-age, revalidate with ETag / Last-Modified
+#            so unchanged pages only cost a 304; responses with neither a
+#            validator nor a positive max-age are not stored
+#   record - always fetch and store every response (for later replay)
+#   replay - serve stored responses only, never touch the network
+# Bodies are stored gzip-compressed next to a small JSON metadata file and the
+# least recently used entries are evicted once the directory exceeds its budget.
+# Replay runs start from empty source watermarks and validate tickers from
+# recorded yfinance lookups, and signalsniper skips publishing and trading, so a
+# recorded cycle re-runs fully offline.
+
+HTTP_CACHE_MODE = os.getenv("SIGNALSNIPER_HTTP_CACHE", "cache").lower()
+HTTP_CACHE_DIR = os.getenv("SIGNALSNIPER_HTTP_CACHE_DIR", ".http_cache")
+HTTP_CACHE_MAX_BYTES = int(os.getenv("SIGNALSNIPER_HTTP_CACHE_MAX_MB", "200")) * 1024 * 1024
+MODES = ("off", "cache", "record", "replay")
+
+class CacheMiss(Exception):
+    """Raised in replay mode when no stored response exists for a URL"""
+
+def parse_cache_control(value: str) -> dict:
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') or True
+    return directives
+
+class ResponseCache:
+    def __init__(self, directory=HTTP_CACHE_DIR, mode=HTTP_CACHE_MODE, max_bytes=HTTP_CACHE_MAX_BYTES):
+        if mode not in MODES:
+            raise ValueError(f"Unknown HTTP cache mode {mode!r}, expected one of {MODES}")
+        self.directory = directory
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self._total = None  # Bytes on disk, seeded by the first evict()
+        self._lock = threading.Lock()
+
+    # === STORAGE ===
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key)
+        return f"{base}.json", f"{base}.gz"
+
+    def lookup(self, url: str):
+        """(metadata, body) for a stored response, or None"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = gzip.decompress(f.read())
+        except (OSError, ValueError, EOFError):
+            return None
+        now = time.time()
+        try:
+            os.utime(body_path, (now, now))  # LRU bookkeeping for eviction
+        except OSError:
+            pass
+        return meta, body
+
+    def _replace_file(self, path: str, data: bytes):
+        """Atomically write `path`, keeping the running byte total in step"""
+        try:
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+        tmp_path = f"{path}.tmp.{threading.get_ident()}"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if self._total is not None:
+                self._total += len(data) - old_size
+
+    def _write_meta(self, meta_path: str, meta: dict):
+        self._replace_file(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _write_entry(self, url: str, meta: dict, body: bytes):
+        os.makedirs(self.directory, exist_ok=True)
+        meta_path, body_path = self._paths(url)
+        self._replace_file(body_path, gzip.compress(body, compresslevel=6))
+        self._write_meta(meta_path, meta)
+        self.evict()
+
+    def store(self, url: str, response) -> dict:
+        meta = {
+            "url": url,
+            "status": response.status_code,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "cache_control": response.headers.get("Cache-Control", ""),
+            "stored_at": time.time(),
+        }
+        self._write_entry(url, meta, response.content)
+        return meta
+
+    def store_value(self, key: str, value):
+        """Record a non-HTTP lookup result (e.g. yfinance info) for replay"""
+        self._write_entry(key, {"url": key, "stored_at": time.time()}, json.dumps(value).encode("utf-8"))
+
+    def lookup_value(self, key: str, default=None):
+        cached = self.lookup(key)
+        if cached is None:
+            return default
+        try:
+            return json.loads(cached[1])
+        except ValueError:
+            return default
+
+    def _scan(self):
+        """(total bytes, {key: bytes}, [(mtime, key)] LRU candidates) for the cache directory"""
+        total = 0
+        sizes = {}
+        entries = []
+        try:
+            scan = list(os.scandir(self.directory))
+        except OSError:
+            return 0, sizes, entries
+        for entry in scan:
+            key, _, ext = entry.name.partition(".")
+            if ext not in ("gz", "json"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            total += stat.st_size
+            sizes[key] = sizes.get(key, 0) + stat.st_size
+            if ext == "gz":
+                entries.append((stat.st_mtime, key))
+        return total, sizes, entries
+
+    def evict(self):
+        """Drop least recently used entries once the cache is over its byte budget"""
+        with self._lock:
+            if self._total is None:
+                self._total = self._scan()[0]  # Seeded once, then tracked by _replace_file
+            if self._total <= self.max_bytes:
+                return
+            total, sizes, entries = self._scan()
+            # Evict down to 90% so the next few stores don't trigger another scan
+            target = self.max_bytes * 0.9
+            for _, key in sorted(entries):
+                if total <= target:
+                    break
+                for ext in ("gz", "json"):
+                    try:
+                        os.remove(os.path.join(self.directory, f"{key}.{ext}"))
+                    except OSError:
+                        pass
+                total -= sizes.get(key, 0)
+            self._total = total
+
+    # === FETCHING ===
+    @staticmethod
+    def is_fresh(meta: dict, now: float = None) -> bool:
+        directives = parse_cache_control(meta.get("cache_control"))
+        if "no-cache" in directives or "no-store" in directives:
+            return False
+        try:
+            max_age = int(directives.get("max-age", 0))
+        except (TypeError, ValueError):
+            return False
+        now = time.time() if now is None else now
+        return now < meta.get("stored_at", 0) + max_age
+
+    @staticmethod
+    def is_reusable(headers) -> bool:
+        """Worth storing in cache mode: revalidatable or fresh for a while, and not no-store"""
+        directives = parse_cache_control(headers.get("Cache-Control"))
+        if "no-store" in directives:
+            return False
+        if headers.get("ETag") or headers.get("Last-Modified"):
+            return True
+        try:
+            return int(directives.get("max-age", 0)) > 0
+        except (TypeError, ValueError):
+            return False
+
+    def get(self, url: str, headers=None, timeout=15):
+        """Return (body, hit_network); raises like requests.get + raise_for_status"""
+        if self.mode == "off":
+            response = requests.get(url, headers=headers, timeout=timeout)
+            response.raise_for_status()
+            return response.content, True
+
+        cached = self.lookup(url)
+        if self.mode == "replay":
+            if cached is None:
+                raise CacheMiss(url)
+            return cached[1], False
+
+        if self.mode == "record":
+            response = requests.get(url, headers=headers, timeout=timeout)
+            response.raise_for_status()
+            self.store(url, response)
+            return response.content, True
+
+        # mode == "cache"
+        headers = dict(headers or {})
+        if cached is not None:
+            meta, body = cached
+            if self.is_fresh(meta):
+                return body, False
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = requests.get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and cached is not None:
+            meta, body = cached
+            meta["stored_at"] = time.time()
+            meta["cache_control"] = response.headers.get("Cache-Control", meta.get("cache_control", ""))
+            meta["etag"] = response.headers.get("ETag", meta.get("etag"))
+            meta_path, _ = self._paths(url)
+            self._write_meta(meta_path, meta)
+            return body, True
+        response.raise_for_status()
+        if self.is_reusable(response.headers):
+            self.store(url, response)
+        return response.content, True
+
+response_cache = ResponseCache()
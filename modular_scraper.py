@@ -4,9 +4,14 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 import pandas as pd
 import re
+import time
 import yfinance as yf
 from typing import Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from http_cache import response_cache, CacheMiss
+from reddit_crawler import RedditCrawler, DEFAULT_WATERMARK_PATH
+from sector_stats import SECTOR_STATS
+from sec_insider import Form4Source, SEC_HEADERS, DEFAULT_WATERMARK_PATH as SEC_WATERMARK_PATH
 
 def safe_get(url, headers=None, timeout=15):
     try:
@@ -16,11 +21,12 @@ def safe_get(url, headers=None, timeout=15):
             "Referer": "https://google.com"
         }
         headers = headers or default_headers
-        response = requests.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        import time
-        time.sleep(0.5)
-        return response.content
+        content, hit_network = response_cache.get(url, headers=headers, timeout=timeout)
+        if hit_network:
+            time.sleep(0.5)  # Only be polite when we actually hit the site
+        return content
+    except CacheMiss:
+        print(f"📼 No recorded response for {url}")
     except requests.exceptions.Timeout:
         print(f"⏰ Timeout fetching {url}")
     except requests.exceptions.RequestException as e:
@@ -40,11 +46,16 @@ def validate_ticker(ticker: str) -> bool:
     return ticker not in false_positives
 
 def verify_ticker_exists(ticker: str) -> Optional[dict]:
+    # Replay validates from recorded lookups so the run never touches the network
+    cache_key = f"yfinance:{ticker}"
+    if response_cache.mode == "replay":
+        return response_cache.lookup_value(cache_key)
+    result = None
     try:
         stock = yf.Ticker(ticker)
         info = stock.info
         if info and 'symbol' in info and info.get('regularMarketPrice'):
-            return {
+            result = {
                 'symbol': info.get('symbol'),
                 'name': info.get('longName', info.get('shortName', '')),
                 'sector': info.get('sector', ''),
@@ -54,7 +65,9 @@ def verify_ticker_exists(ticker: str) -> Optional[dict]:
             }
     except:
         pass
-    return None
+    if response_cache.mode == "record":
+        response_cache.store_value(cache_key, result)
+    return result
 
 def scrape_highshortinterest():
     url = "https://highshortinterest.com/"
@@ -79,31 +92,47 @@ def scrape_highshortinterest():
                 })
     return data
 
-def scrape_reddit_wsb():
-    url = "https://www.reddit.com/r/wallstreetbets/hot.json"
-    try:
-        response = requests.get(url, headers={"User-Agent": "SignalSniper/1.0"})
-        if response.status_code == 200:
-            data_json = response.json()
-            posts = data_json.get('data', {}).get('children', [])
-            data = []
-            for post in posts[:20]:
-                text = post.get('data', {}).get('title', '') + " " + post.get('data', {}).get('selftext', '')
-                tickers = re.findall(r'\$([A-Z]{1,5})', text) or re.findall(r'([A-Z]{2,5})', text)
-                for ticker in tickers:
-                    if validate_ticker(ticker):
-                        data.append({
-                            "source": "Reddit WSB",
-                            "ticker": ticker,
-                            "description": text[:150],
-                            "signal_type": "social_sentiment",
-                            "sector": "reddit_hype"
-                        })
-                        break
-            return data
-    except:
-        pass
-    return []
+# Replay must see the recorded pages as new, so it keeps watermarks in memory only
+REPLAYING = response_cache.mode == "replay"
+
+def fetch_reddit(url):
+    return safe_get(url, headers={"User-Agent": "SignalSniper/1.0"}, timeout=10)
+
+reddit_crawler = RedditCrawler(fetch_reddit, state_path=None if REPLAYING else DEFAULT_WATERMARK_PATH)
+
+def extract_reddit_signal(post):
+    text = post.get('title', '') + " " + post.get('selftext', '')
+    tickers = re.findall(r'\$([A-Z]{1,5})', text) or re.findall(r'([A-Z]{2,5})', text)
+    for ticker in tickers:
+        if validate_ticker(ticker):
+            subreddit = post.get('subreddit', 'wallstreetbets')
+            return {
+                "source": "Reddit WSB" if subreddit.lower() == "wallstreetbets" else f"Reddit r/{subreddit}",
+                "ticker": ticker,
+                "description": text[:150],
+                "signal_type": "social_sentiment",
+                "sector": "reddit_hype"
+            }
+    return None
+
+def scrape_reddit():
+    """Ticker signals from posts that are new since the last crawl, across all configured subreddits"""
+    data = []
+    for subreddit, posts in reddit_crawler.crawl().items():
+        for post in posts:
+            signal = extract_reddit_signal(post)
+            if signal:
+                data.append(signal)
+    return data
+
+def fetch_sec(url):
+    return safe_get(url, headers=SEC_HEADERS, timeout=10)
+
+form4_source = Form4Source(fetch_sec, state_path=None if REPLAYING else SEC_WATERMARK_PATH)
+
+def scrape_sec_form4():
+    """Insider buys / sells from Form 4 filings since the last poll"""
+    return [s for s in form4_source.poll() if validate_ticker(s['ticker'])]
 
 def calculate_enhanced_score(row):
     score = 0
@@ -138,11 +167,35 @@ def calculate_enhanced_score(row):
             score += 10
     return min(score, 100)
 
+SOURCE_BONUS = 10  # Added per extra source family corroborating a ticker
+TOP_K = 20  # filter_valid_tickers only validates the top 20 anyway
+
+def source_family(source: str) -> str:
+    """Collapse per-feed labels (e.g. every "Reddit r/..." subreddit) into one evidence source"""
+    source = str(source).lower()
+    for family in ('reddit', 'sec'):
+        if source.startswith(family):
+            return family
+    return source.replace(' ', '')
+
+def fuse_signals(df, top_k=TOP_K):
+    """Merge rows per ticker in one hash pass: best row + corroboration bonus, top-K without a full sort"""
+    if df.empty:
+        return df
+    grouped = df.groupby('ticker', sort=False)
+    fused = df.loc[grouped['signal_score'].idxmax()].set_index('ticker')
+    source_count = df['source'].map(source_family).groupby(df['ticker'], sort=False).nunique()
+    fused['base_score'] = fused['signal_score']
+    fused['signal_score'] = (fused['base_score'] + SOURCE_BONUS * (source_count - 1)).clip(upper=100)
+    fused['source_count'] = source_count
+    fused['sources'] = grouped['source'].unique().map(list)
+    return fused.reset_index().nlargest(top_k, 'signal_score')
+
 def filter_valid_tickers(df):
     if df.empty:
         return df
     top = df.head(20)
-    valid = set()
+    valid = {}  # ticker -> verify_ticker_exists info
     with ThreadPoolExecutor(max_workers=10) as executor:
         futures = {
             executor.submit(verify_ticker_exists, ticker): ticker
@@ -151,16 +204,28 @@ def filter_valid_tickers(df):
         for future in as_completed(futures):
             ticker = futures[future]
             try:
-                if future.result():
-                    valid.add(ticker)
+                info = future.result()
+                if info:
+                    valid[ticker] = info
             except:
                 pass
     print(f"🔍 Validated {len(valid)} tickers.")
-    return df[df['ticker'].isin(valid)].copy()
+    df = df[df['ticker'].isin(list(valid))].copy()
+    # Verified quote rides along so price trigger rules have something to match
+    df['price'] = df['ticker'].map(lambda ticker: valid[ticker].get('price'))
+    return df
+
+# Source registry shared by the single-process loop and worker mode
+SCRAPERS = {
+    "highshortinterest": scrape_highshortinterest,
+    "reddit": scrape_reddit,
+    "sec_form4": scrape_sec_form4,
+}
 
-def run_all_scrapers():
+def score_signals(scrapers=None):
+    """Run the scrapers (all of them by default) and score every raw signal"""
     all_data = []
-    scrapers = [scrape_highshortinterest, scrape_reddit_wsb]
+    scrapers = list(SCRAPERS.values()) if scrapers is None else scrapers
     for scraper in scrapers:
         try:
             print(f"🔍 Running {scraper.__name__}...")
@@ -175,14 +240,24 @@ def run_all_scrapers():
     df = pd.DataFrame(all_data)
     df["scraped_at"] = datetime.now().isoformat()
     df['signal_score'] = df.apply(calculate_enhanced_score, axis=1)
-    df = df.sort_values('signal_score', ascending=False)
-    df = df.drop_duplicates(subset=['ticker'], keep='first')
+    # Rolling stats see every scored signal, before fusion and validation narrow the frame
+    SECTOR_STATS.record_frame(df)
+    return df
+
+def rank_signals(df):
+    """Fuse scored signals per ticker across sources and validate the top tickers"""
+    if df.empty:
+        return df
+    df = fuse_signals(df)
     df = filter_valid_tickers(df)
     print(f"🎯 Total unique signals: {len(df)}")
     if len(df) > 0:
         print(f"🏆 Top signal: {df.iloc[0]['ticker']} (Score: {df.iloc[0]['signal_score']})")
     return df
 
+def run_all_scrapers(scrapers=None):
+    return rank_signals(score_signals(scrapers))
+
 if __name__ == "__main__":
     df = run_all_scrapers()
     if len(df) > 0:
@@ -0,0 +1,130 @@
+import os
+import json
+from collections import deque
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Incremental Reddit crawler. Polls several subreddits concurrently, follows the
+# listing `after` cursor and keeps a per-subreddit watermark of post IDs already
+# seen, so each cycle only hands back posts that are new since the last one.
+# `fetch(url) -> bytes | None` is injected: modular_scraper passes safe_get, and
+# recorded listings can be replayed with e.g. `lambda url: fixtures.get(url)`.
+
+DEFAULT_SUBREDDITS = [
+    s.strip() for s in os.getenv("REDDIT_SUBREDDITS", "wallstreetbets,stocks,pennystocks,options").split(",")
+    if s.strip()
+]
+DEFAULT_LISTING = os.getenv("REDDIT_LISTING", "new")
+DEFAULT_WATERMARK_PATH = os.getenv("REDDIT_WATERMARK_PATH", "reddit_watermarks.json")
+LISTING_URL = "https://www.reddit.com/r/{subreddit}/{listing}.json"
+
+def listing_url(subreddit: str, listing: str = DEFAULT_LISTING, limit: int = 100, after: str = None) -> str:
+    params = {"limit": limit}
+    if after:
+        params["after"] = after
+    return f"{LISTING_URL.format(subreddit=subreddit, listing=listing)}?{urlencode(params)}"
+
+class RedditCrawler:
+    def __init__(self, fetch, subreddits=None, listing=DEFAULT_LISTING, max_pages=3,
+                 page_size=100, max_workers=4, watermark_size=2000, state_path=None):
+        self.fetch = fetch
+        self.subreddits = list(subreddits or DEFAULT_SUBREDDITS)
+        self.listing = listing
+        self.max_pages = max_pages
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.watermark_size = watermark_size
+        self.state_path = state_path
+        self._seen = {}  # subreddit -> (set of ids, deque of ids in arrival order)
+
+    # === WATERMARKS ===
+    def _watermark(self, subreddit: str):
+        if subreddit not in self._seen:
+            self._seen[subreddit] = (set(), deque())
+        return self._seen[subreddit]
+
+    def _mark_seen(self, subreddit: str, post_ids):
+        seen, order = self._watermark(subreddit)
+        for post_id in post_ids:
+            if post_id in seen:
+                continue
+            seen.add(post_id)
+            order.append(post_id)
+            if len(order) > self.watermark_size:
+                seen.discard(order.popleft())
+
+    def load_state(self):
+        """Reload watermarks from disk (shared by --once runs and workers)"""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read Reddit watermarks: {e}")
+            return
+        self._seen = {}
+        for subreddit, post_ids in state.items():
+            self._mark_seen(subreddit, post_ids)
+
+    def save_state(self):
+        if not self.state_path:
+            return
+        state = {subreddit: list(order) for subreddit, (_, order) in self._seen.items()}
+        tmp_path = f"{self.state_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"⚠️ Could not save Reddit watermarks: {e}")
+
+    # === CRAWLING ===
+    def crawl_subreddit(self, subreddit: str) -> list:
+        """Return posts in `subreddit` not seen before, newest first"""
+        seen, _ = self._watermark(subreddit)
+        new_posts = []
+        after = None
+        for _ in range(self.max_pages):
+            body = self.fetch(listing_url(subreddit, self.listing, self.page_size, after))
+            if not body:
+                break
+            try:
+                listing = json.loads(body).get("data", {})
+            except (ValueError, AttributeError):
+                print(f"⚠️ Bad Reddit listing for r/{subreddit}")
+                break
+            reached_watermark = False
+            for child in listing.get("children", []):
+                post = child.get("data", {})
+                post_id = post.get("name") or post.get("id")
+                if not post_id:
+                    continue
+                if post_id in seen:
+                    reached_watermark = True
+                    continue
+                post.setdefault("subreddit", subreddit)
+                new_posts.append(post)
+            after = listing.get("after")
+            if reached_watermark or not after:
+                break
+        return new_posts
+
+    def crawl(self) -> dict:
+        """Crawl every subreddit concurrently, advance watermarks, return subreddit -> new posts"""
+        self.load_state()
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.crawl_subreddit, sub): sub for sub in self.subreddits}
+            for future in as_completed(futures):
+                subreddit = futures[future]
+                try:
+                    results[subreddit] = future.result()
+                except Exception as e:
+                    print(f"❌ r/{subreddit} crawl failed: {e}")
+                    results[subreddit] = []
+        for subreddit, posts in results.items():
+            # Oldest first so the newest IDs are the last to be evicted
+            self._mark_seen(subreddit, [p.get("name") or p.get("id") for p in reversed(posts)])
+        self.save_state()
+        return results
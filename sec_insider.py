@@ -0,0 +1,234 @@
+import io
+import os
+import json
+from collections import deque
+import xml.etree.ElementTree as ET
+
+# Streaming SEC Form 4 (insider transaction) source. Reads the EDGAR "current
+# filings" Atom feed and each filing's ownership XML with iterparse, clearing
+# elements as they complete so no full DOM is ever built. Accession numbers
+# already processed are kept as a watermark so each filing is emitted once, and
+# the feed is paged with `start=` until it reaches the watermark (or a page cap).
+# `fetch(url) -> bytes | None` is injected (safe_get in modular_scraper), so
+# saved feed / filing fixtures can be replayed with `lambda url: fixtures.get(url)`.
+
+FORM4_FEED_URL = (
+    "https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&type=4"
+    "&company=&dateb=&owner=include&start={start}&count={count}&output=atom"
+)
+DEFAULT_WATERMARK_PATH = os.getenv("SEC_WATERMARK_PATH", "sec_watermarks.json")
+SEC_HEADERS = {
+    # EDGAR rejects requests without a descriptive User-Agent that includes a contact
+    "User-Agent": os.getenv("SEC_USER_AGENT", "SignalSniper/1.0 contact@example.com"),
+    "Accept-Encoding": "gzip, deflate",
+}
+
+# Open-market transaction codes we turn into signals
+TRANSACTION_TYPES = {
+    "P": ("buy", "insider_trading"),
+    "S": ("sell", "insider_selling"),
+}
+
+def _local(tag: str) -> str:
+    """Strip the XML namespace from a tag"""
+    return tag.rsplit("}", 1)[-1]
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+def parse_feed(body: bytes):
+    """Yield (accession, index_url) per Atom entry, streaming"""
+    entry = {}
+    for event, elem in ET.iterparse(io.BytesIO(body), events=("end",)):
+        tag = _local(elem.tag)
+        if tag == "id" and elem.text and "accession-number=" in elem.text:
+            entry["accession"] = elem.text.rsplit("=", 1)[-1].strip()
+        elif tag == "link" and elem.get("href"):
+            entry["index_url"] = elem.get("href")
+        elif tag == "entry":
+            if entry.get("accession") and entry.get("index_url"):
+                yield entry["accession"], entry["index_url"]
+            entry = {}
+            elem.clear()
+
+def parse_form4(body: bytes) -> dict:
+    """Summarize a Form 4 ownership document without building its tree"""
+    filing = {"ticker": "", "issuer": "", "owner": "", "roles": [], "transactions": []}
+    txn = None
+    path = []
+    for event, elem in ET.iterparse(io.BytesIO(body), events=("start", "end")):
+        tag = _local(elem.tag)
+        if event == "start":
+            path.append(tag)
+            if tag in ("nonDerivativeTransaction", "derivativeTransaction"):
+                txn = {"code": "", "shares": 0.0, "price": 0.0, "acquired": "", "date": ""}
+            continue
+
+        text = (elem.text or "").strip()
+        parent = path[-2] if len(path) > 1 else ""
+        if tag == "issuerTradingSymbol":
+            filing["ticker"] = text.upper()
+        elif tag == "issuerName":
+            filing["issuer"] = text
+        elif tag == "rptOwnerName" and not filing["owner"]:
+            filing["owner"] = text
+        elif tag in ("isDirector", "isOfficer", "isTenPercentOwner") and text in ("1", "true"):
+            filing["roles"].append({"isDirector": "Director", "isOfficer": "Officer",
+                                    "isTenPercentOwner": "10% Owner"}[tag])
+        elif tag == "officerTitle" and text:
+            filing["roles"].append(text)
+        elif txn is not None:
+            if tag == "transactionCode":
+                txn["code"] = text
+            elif tag == "value" and parent == "transactionShares":
+                txn["shares"] = _float(text)
+            elif tag == "value" and parent == "transactionPricePerShare":
+                txn["price"] = _float(text)
+            elif tag == "value" and parent == "transactionAcquiredDisposedCode":
+                txn["acquired"] = text
+            elif tag == "value" and parent == "transactionDate":
+                txn["date"] = text
+            elif tag == "nonDerivativeTransaction":
+                filing["transactions"].append(txn)
+                txn = None
+            elif tag == "derivativeTransaction":
+                txn = None  # Option grants / exercises are not open-market trades
+
+        path.pop()
+        elem.clear()
+    return filing
+
+def filing_signals(filing: dict, accession: str) -> list:
+    """Typed insider signals (one per direction) for a parsed filing"""
+    totals = {}
+    for txn in filing["transactions"]:
+        if txn["code"] not in TRANSACTION_TYPES:
+            continue
+        shares, value = totals.get(txn["code"], (0.0, 0.0))
+        totals[txn["code"]] = (shares + txn["shares"], value + txn["shares"] * txn["price"])
+
+    signals = []
+    role = ", ".join(dict.fromkeys(filing["roles"])) or "Insider"
+    for code, (shares, value) in totals.items():
+        action, signal_type = TRANSACTION_TYPES[code]
+        verb = "bought" if action == "buy" else "sold"
+        signals.append({
+            "source": "SEC Form 4",
+            "ticker": filing["ticker"],
+            "company": filing["issuer"][:50],
+            "signal_type": signal_type,
+            "sector": "insider",
+            "insider_action": action,
+            "insider_name": filing["owner"],
+            "insider_role": role,
+            "shares": int(shares),
+            "value": round(value, 2),
+            "accession": accession,
+            "description": f"{filing['owner']} ({role}) {verb} {int(shares):,} shares of {filing['ticker']} for ${value:,.0f}",
+        })
+    return signals
+
+def filing_xml_url(index_url: str, fetch) -> str:
+    """Locate the ownership XML next to a filing's -index.htm page"""
+    folder = index_url.rsplit("/", 1)[0]
+    body = fetch(f"{folder}/index.json")
+    if not body:
+        return None
+    try:
+        items = json.loads(body).get("directory", {}).get("item", [])
+    except (ValueError, AttributeError):
+        return None
+    for item in items:
+        name = item.get("name", "")
+        if name.endswith(".xml") and "index" not in name:
+            return f"{folder}/{name}"
+    return None
+
+class Form4Source:
+    def __init__(self, fetch, page_size=40, max_pages=5, watermark_size=5000, state_path=None):
+        self.fetch = fetch
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.watermark_size = watermark_size
+        self.state_path = state_path
+        self._seen = set()
+        self._order = deque()
+
+    def _mark_seen(self, accession: str):
+        if accession in self._seen:
+            return
+        self._seen.add(accession)
+        self._order.append(accession)
+        if len(self._order) > self.watermark_size:
+            self._seen.discard(self._order.popleft())
+
+    def load_state(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                accessions = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read SEC watermarks: {e}")
+            return
+        self._seen, self._order = set(), deque()
+        for accession in accessions:
+            self._mark_seen(accession)
+
+    def save_state(self):
+        if not self.state_path:
+            return
+        tmp_path = f"{self.state_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(list(self._order), f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"⚠️ Could not save SEC watermarks: {e}")
+
+    def new_filings(self):
+        """(accession, index_url) for feed entries past the watermark, oldest first"""
+        pending = {}
+        for page in range(self.max_pages):
+            body = self.fetch(FORM4_FEED_URL.format(start=page * self.page_size, count=self.page_size))
+            if not body:
+                break
+            entries = 0
+            reached_watermark = False
+            try:
+                for accession, index_url in parse_feed(body):
+                    entries += 1
+                    if accession in self._seen:
+                        reached_watermark = True
+                    elif accession not in pending:
+                        # Each filing is listed once for the issuer and once per reporting owner
+                        pending[accession] = index_url
+            except ET.ParseError as e:
+                print(f"⚠️ Bad Form 4 feed: {e}")
+                break
+            if reached_watermark or entries < self.page_size:
+                break
+        return list(reversed(pending.items()))
+
+    def poll(self) -> list:
+        """Signals for every Form 4 filed since the last poll"""
+        self.load_state()
+        signals = []
+        for accession, index_url in self.new_filings():
+            xml_url = filing_xml_url(index_url, self.fetch)
+            body = self.fetch(xml_url) if xml_url else None
+            if not body:
+                continue  # Leave it unmarked so the next poll retries
+            try:
+                filing = parse_form4(body)
+            except ET.ParseError as e:
+                print(f"⚠️ Bad Form 4 XML for {accession}: {e}")
+            else:
+                if filing["ticker"]:
+                    signals.extend(filing_signals(filing, accession))
+            self._mark_seen(accession)
+        self.save_state()
+        return signals
@@ -0,0 +1,188 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from source_leases import DEFAULT_LEASE_DB
+
+# Rolling per-sector / per-signal_type statistics across scrape cycles.
+# Each (dimension, value, window) is a ring of time buckets kept as rows of a
+# shared SQLite file (the worker lease DB by default). A bucket lives in slot
+# `index % size` and is overwritten once the ring wraps, so recording a signal
+# touches one row per window and a query reads at most one window of buckets.
+#
+# Every process adds to the same rings: the loop, `--once` runs from cron and
+# each --worker record the signals they scored (modular_scraper.run_all_scrapers),
+# and the feed server reads them back for GET /sector-stats.
+
+# window name -> (span seconds, bucket width seconds)
+WINDOWS = {
+    "15m": (15 * 60, 60),
+    "1h": (60 * 60, 60),
+    "1d": (24 * 60 * 60, 15 * 60),
+}
+DIMENSIONS = ("sector", "signal_type")
+SECTOR_STATS_DB = os.getenv("SECTOR_STATS_DB", DEFAULT_LEASE_DB)
+DB_TIMEOUT = 30  # Seconds to wait for another process's write lock
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sector_buckets (
+    dimension TEXT NOT NULL,
+    value     TEXT NOT NULL,
+    win       TEXT NOT NULL,
+    slot      INTEGER NOT NULL,
+    bucket    INTEGER NOT NULL,
+    count     INTEGER NOT NULL,
+    total     REAL NOT NULL,
+    max_score REAL,
+    tickers   TEXT NOT NULL,
+    PRIMARY KEY (dimension, value, win, slot)
+)
+"""
+
+class RollingSectorStats:
+    """Per-sector and per-signal_type aggregates over 15m / 1h / 1d, shared through SQLite"""
+
+    def __init__(self, path=SECTOR_STATS_DB, windows=None, dimensions=DIMENSIONS):
+        self.path = path
+        self.windows = windows or WINDOWS
+        self.dimensions = dimensions
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode; transactions are opened explicitly below
+            conn = sqlite3.connect(self.path, timeout=DB_TIMEOUT, isolation_level=None)
+            conn.execute(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        # IMMEDIATE so concurrent writers merge into a bucket instead of overwriting it
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def record_many(self, signals, ts: float = None):
+        """Fold signals into every window of their sector and signal_type, in one transaction"""
+        ts = time.time() if ts is None else ts
+        # Pre-aggregate per bucket so each row is read and written once
+        pending = {}  # (dimension, value, window, bucket) -> [count, total, max, tickers]
+        for signal in signals:
+            try:
+                score = float(signal.get("signal_score", 0) or 0)
+            except (TypeError, ValueError):
+                score = 0.0
+            ticker = signal.get("ticker")
+            for dimension in self.dimensions:
+                value = signal.get(dimension)
+                if not value or value != value:  # Missing or NaN
+                    continue
+                for window, (_, width) in self.windows.items():
+                    key = (dimension, str(value), window, int(ts // width))
+                    part = pending.get(key)
+                    if part is None:
+                        part = pending[key] = [0, 0.0, score, set()]
+                    part[0] += 1
+                    part[1] += score
+                    part[2] = max(part[2], score)
+                    if ticker:
+                        part[3].add(ticker)
+        if not pending:
+            return
+        with self._transaction() as conn:
+            for (dimension, value, window, bucket), (count, total, max_score, tickers) in pending.items():
+                span, width = self.windows[window]
+                slot = bucket % (span // width)
+                row = conn.execute(
+                    "SELECT bucket, count, total, max_score, tickers FROM sector_buckets "
+                    "WHERE dimension = ? AND value = ? AND win = ? AND slot = ?",
+                    (dimension, value, window, slot),
+                ).fetchone()
+                if row is not None and row[0] > bucket:
+                    continue  # Slot already holds a newer lap; this bucket is out of the window
+                if row is not None and row[0] == bucket:
+                    count += row[1]
+                    total += row[2]
+                    max_score = max(max_score, row[3]) if row[3] is not None else max_score
+                    tickers |= set(json.loads(row[4]))
+                conn.execute(
+                    "INSERT OR REPLACE INTO sector_buckets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (dimension, value, window, slot, bucket, count, total, max_score, json.dumps(sorted(tickers))),
+                )
+
+    def record(self, signal: dict, ts: float = None):
+        self.record_many([signal], ts)
+
+    def record_frame(self, df, ts: float = None):
+        if df is None or df.empty:
+            return
+        try:
+            self.record_many(df.to_dict("records"), ts)
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not record sector stats: {e}")
+
+    def _stats(self, dimension: str, window: str, now: float, value: str = None) -> dict:
+        """value -> stats over the live buckets of `window` at `now`"""
+        span, width = self.windows[window]
+        head = int(now // width)
+        query = ("SELECT value, count, total, max_score, tickers FROM sector_buckets "
+                 "WHERE dimension = ? AND win = ? AND bucket > ? AND bucket <= ?")
+        params = [dimension, window, head - span // width, head]
+        if value is not None:
+            query += " AND value = ?"
+            params.append(value)
+        totals = {}  # value -> [count, total, max, tickers]
+        for value, count, total, max_score, tickers in self._connect().execute(query, params):
+            acc = totals.get(value)
+            if acc is None:
+                acc = totals[value] = [0, 0.0, None, set()]
+            acc[0] += count
+            acc[1] += total
+            if max_score is not None:
+                acc[2] = max_score if acc[2] is None else max(acc[2], max_score)
+            acc[3].update(json.loads(tickers))
+        return {
+            value: {
+                "count": count,
+                "mean_score": round(total / count, 2) if count else 0.0,
+                "max_score": max_score,
+                "distinct_tickers": len(tickers),
+            }
+            for value, (count, total, max_score, tickers) in totals.items()
+            if count
+        }
+
+    def get(self, dimension: str, value: str, window: str = "1h", now: float = None):
+        """Stats for one sector / signal_type, or None if nothing landed in the window"""
+        now = time.time() if now is None else now
+        return self._stats(dimension, window, now, value).get(value)
+
+    def snapshot(self, dimension: str = "sector", window: str = "1h", now: float = None) -> dict:
+        """value -> stats for everything seen in `window`, strongest mean score first"""
+        now = time.time() if now is None else now
+        rows = self._stats(dimension, window, now)
+        return dict(sorted(rows.items(), key=lambda kv: kv[1]["mean_score"], reverse=True))
+
+    def export(self, now: float = None) -> dict:
+        """Every dimension x window snapshot, JSON-ready"""
+        now = time.time() if now is None else now
+        return {
+            "generated_at": now,
+            "windows": list(self.windows),
+            "stats": {
+                dimension: {window: self.snapshot(dimension, window, now) for window in self.windows}
+                for dimension in self.dimensions
+            },
+        }
+
+# Shared aggregator, fed by modular_scraper.run_all_scrapers
+SECTOR_STATS = RollingSectorStats()
@@ -4,22 +4,40 @@ import requests
 from datetime import datetime
 import pytz
 
+try:
+    import pyarrow as pa
+except ImportError:  # Without pyarrow the feed is requested as JSON
+    pa = None
+
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+
 st.set_page_config(page_title="Signal Sniper - Live Feed", layout="wide")
 
 st.title("🧠 Signal Sniper - Live Feed")
 
 # Replace this URL with your actual endpoint
 API_URL = "https://your-n8n-webhook/render-feed"
+SECTOR_STATS_URL = "https://your-n8n-webhook/sector-stats"
 
-try:
-    response = requests.get(API_URL)
+def load_feed(url):
+    """Fetch the feed as Arrow IPC when the endpoint supports it, JSON otherwise"""
+    accept = f"{ARROW_MIME}, application/json;q=0.5" if pa is not None else "application/json"
+    response = requests.get(url, headers={"Accept": accept})
     response.raise_for_status()
-    data = response.json()
 
-    df = pd.DataFrame(data)
+    if pa is not None and response.headers.get("Content-Type", "").startswith(ARROW_MIME):
+        table = pa.ipc.open_stream(response.content).read_all()
+        # Typed columns come straight across; self_destruct frees Arrow buffers as they convert
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    return pd.DataFrame(response.json())
+
+try:
+    df = load_feed(API_URL)
 
     if "timestamp" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
+        if not pd.api.types.is_datetime64_any_dtype(df["timestamp"]):
+            df["timestamp"] = pd.to_datetime(df["timestamp"])
 
         # Fix: if already tz-aware, just convert to Eastern; otherwise localize to UTC then convert
         if df["timestamp"].dt.tz is None:
@@ -33,3 +51,18 @@ try:
 
 except Exception as e:
     st.error(f"Error fetching or processing data: {e}")
+
+# Rolling sector / signal_type strength, computed by the scraper process
+try:
+    snapshot = requests.get(SECTOR_STATS_URL).json()
+    stats = snapshot.get("stats", {})
+    if stats:
+        st.subheader("📈 Sector Trends")
+        window = st.radio("Window", snapshot.get("windows", ["15m", "1h", "1d"]), index=1, horizontal=True)
+        for dimension, by_window in stats.items():
+            rows = by_window.get(window, {})
+            if rows:
+                st.caption(dimension)
+                st.dataframe(pd.DataFrame.from_dict(rows, orient="index"), use_container_width=True)
+except Exception as e:
+    st.warning(f"Sector stats unavailable: {e}")
@@ -1,11 +1,13 @@
 import os
+import sys
 import time
-import requests
+import argparse
 from datetime import datetime, timezone
 from dotenv import load_dotenv
-from alpaca_trade_api.rest import REST
-from supabase import create_client, Client
-from modular_scraper import run_all_scrapers
+
+# Heavy dependencies (pandas, yfinance, bs4, alpaca_trade_api, supabase, requests)
+# are imported inside the functions that need them so that `import signalsniper`
+# stays cheap and works without credentials (cron, serverless, tooling).
 
 # === ENV SETUP ===
 load_dotenv()
@@ -18,15 +20,36 @@ SUPABASE_KEY = os.getenv("SUPABASE_API_KEY")
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
-# === INIT CLIENTS ===
-alpaca = REST(ALPACA_API_KEY, ALPACA_SECRET_KEY, ALPACA_BASE_URL)
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+LOOP_INTERVAL = 60  # Seconds between cycles in loop mode
+ERROR_BACKOFF = 10  # Seconds to wait after a failed cycle
+FUSION_LEASE = "__fusion__"  # Pseudo-source whose lease guards each interval's fusion step
+
+# === LAZY CLIENTS ===
+_alpaca = None
+_supabase = None
+
+def get_alpaca():
+    """Build the Alpaca REST client on first use"""
+    global _alpaca
+    if _alpaca is None:
+        from alpaca_trade_api.rest import REST
+        _alpaca = REST(ALPACA_API_KEY, ALPACA_SECRET_KEY, ALPACA_BASE_URL)
+    return _alpaca
+
+def get_supabase():
+    """Build the Supabase client on first use"""
+    global _supabase
+    if _supabase is None:
+        from supabase import create_client
+        _supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+    return _supabase
 
 # === TELEGRAM FUNCTION ===
 def send_telegram_message(message: str):
     if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
         print("Telegram not configured.")
         return
+    import requests
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
     payload = {"chat_id": TELEGRAM_CHAT_ID, "text": message}
     try:
@@ -35,28 +58,159 @@ def send_telegram_message(message: str):
     except Exception as e:
         print(f"Telegram error: {e}")
 
+# === SIGNAL HANDLING ===
+def publish_signal(signal: dict):
+    """Log a signal to Supabase, push it to n8n and alert Telegram"""
+    import requests
+    from http_cache import response_cache
+    print("🟢 New signal:", signal)
+
+    # Clean UTC timestamp
+    signal["timestamp"] = datetime.now(timezone.utc).isoformat()
+
+    # Replayed cycles stay offline: print only, no Supabase / n8n / Telegram
+    if response_cache.mode == "replay":
+        return
+
+    # Supabase log
+    get_supabase().table("signals").insert(signal).execute()
+
+    # Webhook push
+    requests.post(N8N_WEBHOOK_URL, json=signal)
+
+    # Telegram alert
+    message = f"🚨 New Signal:\n{signal['ticker']} - {signal.get('strategy', signal.get('signal_type', ''))}\n{signal.get('summary', signal.get('description', ''))}"
+    send_telegram_message(message)
+
+def signal_records(df):
+    """DataFrame rows as JSON-ready dicts"""
+    # Scrapers emit different columns, so most cells are NaN; JSON (n8n, Supabase) needs None
+    return df.astype(object).where(df.notna(), None).to_dict("records") if len(df) else []
+
+def collect_signals(scrapers=None):
+    """Run the scrapers once (all of them by default) and return signal records"""
+    from modular_scraper import run_all_scrapers
+    return signal_records(run_all_scrapers(scrapers))
+
+def run_cycle(scrapers=None):
+    """Run the scrapers once and publish the resulting signals"""
+    signals = collect_signals(scrapers)
+    for signal in signals:
+        publish_signal(signal)
+    return signals
+
 # === MAIN LOOP ===
-while True:
+def run_forever():
+    while True:
+        try:
+            run_cycle()
+            time.sleep(LOOP_INTERVAL)
+        except Exception as e:
+            print(f"Error: {e}")
+            time.sleep(ERROR_BACKOFF)
+
+# === WORKER MODE ===
+def publish_fused(store, slot, sources, final=False):
+    """Fuse what every worker staged for `slot` across sources and publish it, once per slot.
+
+    Normally whoever completes the last source fuses; with `final` (the slot is
+    over) it goes ahead without sources that failed or were never picked up.
+    """
+    import pandas as pd
+    from modular_scraper import rank_signals
+    from source_leases import LeaseLost
+
     try:
-        signals = run_all_scrapers()
-        for signal in signals:
-            print("🟢 New signal:", signal)
+        if store.pending_sources(sources, slot, live_only=final):
+            return  # Still being scraped
+        if not store.claim(FUSION_LEASE, slot):
+            return
+    except Exception as e:
+        print(f"⚠️ Lease error for {FUSION_LEASE}: {e}")
+        return
+    published = 0
+    try:
+        with store.heartbeat(FUSION_LEASE) as lease_lost:
+            signals = signal_records(rank_signals(pd.DataFrame(store.staged(slot))))
+            for signal in signals:
+                if lease_lost.is_set():
+                    raise LeaseLost(FUSION_LEASE)
+                published += 1  # Counted up front: a half-sent signal still counts
+                publish_signal(signal)
+    except Exception as e:
+        print(f"Error fusing slot {slot}: {e}")
+        if not published:
+            store.release(FUSION_LEASE)  # Nothing went out, let any worker retry
+            return
+    # Once anything was published the slot is done, even if it failed partway
+    if not store.complete(FUSION_LEASE, slot):
+        print(f"⚠️ Fusion lease was taken over during slot {slot}")
+    store.clear_staged(slot)
 
-            # Clean UTC timestamp
-            signal["timestamp"] = datetime.utcnow().replace(tzinfo=timezone.utc).isoformat()
+def run_worker(lease_db=None, worker_id=None, interval=LOOP_INTERVAL, once=False):
+    """Claim sources through shared leases so several processes split the registry"""
+    import random
+    from modular_scraper import SCRAPERS, score_signals
+    from source_leases import LeaseStore, LeaseLost, DEFAULT_LEASE_DB, current_slot
 
-            # Supabase log
-            supabase.table("signals").insert(signal).execute()
+    store = LeaseStore(lease_db or DEFAULT_LEASE_DB, worker_id)
+    print(f"👷 Worker {store.worker_id} sharing {len(SCRAPERS)} sources via {store.path}")
+    while True:
+        slot = current_slot(interval)
+        # Close out the previous interval if the worker that finished it died before fusing
+        publish_fused(store, slot - 1, list(SCRAPERS), final=True)
+        names = list(SCRAPERS)
+        random.shuffle(names)  # Spread workers over the registry
+        for name in names:
+            try:
+                if not store.claim(name, slot):
+                    continue
+            except Exception as e:
+                print(f"⚠️ Lease error for {name}: {e}")
+                continue
+            try:
+                with store.heartbeat(name) as lease_lost:
+                    # Scored but not fused: fusion needs every source's rows for the slot
+                    staged = signal_records(score_signals([SCRAPERS[name]]))
+                    if lease_lost.is_set():
+                        raise LeaseLost(name)
+            except Exception as e:
+                print(f"Error in {name}: {e}")
+                store.release(name)  # Nothing staged, let any worker retry
+                continue
+            if not store.complete(name, slot, staged):
+                print(f"⚠️ Lease on {name} was taken over during slot {slot}")
+        publish_fused(store, slot, list(SCRAPERS))
+        if once:
+            return
+        # Wake for the next interval, polling in between for expired leases
+        next_slot_at = (slot + 1) * interval
+        time.sleep(max(1, min(store.ttl, next_slot_at - time.time())))
 
-            # Webhook push
-            requests.post(N8N_WEBHOOK_URL, json=signal)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Signal Sniper scraper loop")
+    parser.add_argument("--once", action="store_true",
+                        help="Run a single cycle and exit (cron / serverless)")
+    parser.add_argument("--worker", action="store_true",
+                        help="Share sources with other workers through leases")
+    parser.add_argument("--lease-db", help="Shared SQLite lease file for --worker")
+    parser.add_argument("--worker-id", help="Worker name (defaults to host-pid)")
+    args = parser.parse_args(argv)
 
-            # Telegram alert
-            message = f"🚨 New Signal:\n{signal['ticker']} - {signal['strategy']}\n{signal.get('summary', '')}"
-            send_telegram_message(message)
+    if args.worker:
+        run_worker(args.lease_db, args.worker_id, once=args.once)
+        return 0
 
-        time.sleep(60)
+    if args.once:
+        try:
+            run_cycle()
+        except Exception as e:
+            print(f"Error: {e}")
+            return 1
+        return 0
 
-    except Exception as e:
-        print(f"Error: {e}")
-        time.sleep(10)
+    run_forever()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,9 @@ from dotenv import load_dotenv
 from alpaca_trade_api.rest import REST
 from supabase import create_client, Client
 from modular_scraper import run_all_scrapers  # 🎯 Pull in your enhanced scrapers
+from sector_stats import SECTOR_STATS
+from triggers import TriggerEngine, Rule, parse_rule
+from http_cache import response_cache
 
 # === ENV SETUP ===
 load_dotenv()
@@ -23,23 +26,30 @@ supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 test_mode = True
 real_threshold = 75  # Trade only if score exceeds this (when not testing)
 min_score_threshold = 50  # Minimum score to consider
+replaying = response_cache.mode == "replay"  # Offline re-run: no orders, logs or webhooks
+
+# === TRADE TRIGGERS ===
+# real_threshold is the default rule; extra rules come from TRADE_TRIGGERS,
+# separated by ";" e.g. "score >= 70 and sector = biotech; TSLA price crosses above 270"
+trade_triggers = TriggerEngine()
+trade_triggers.add(Rule("signal_score", ">=", real_threshold, rule_id="real_threshold"))
+for rule_text in filter(None, (r.strip() for r in os.getenv("TRADE_TRIGGERS", "").split(";"))):
+    try:
+        trade_triggers.add(parse_rule(rule_text))
+    except ValueError as e:
+        print(f"⚠️ Skipping trigger: {e}")
 
 # === INIT CLIENT ===
 alpaca = REST(ALPACA_API_KEY, ALPACA_SECRET_KEY, ALPACA_BASE_URL)
 
 # === ENHANCED SECTOR ANALYSIS ===
-def analyze_sector_trends(df):
-    """Analyze which sectors are showing strength"""
-    if df.empty:
-        return {}
-    
-    sector_analysis = df.groupby('sector').agg({
-        'signal_score': ['mean', 'count', 'max'],
-        'ticker': 'count'
-    }).round(2)
+def analyze_sector_trends(window="1h"):
+    """Report which sectors are showing strength over the rolling window"""
+    sector_analysis = SECTOR_STATS.snapshot("sector", window)
     
-    print("\n📈 Sector Analysis:")
-    print(sector_analysis)
+    print(f"\n📈 Sector Analysis ({window}):")
+    for sector, stats in sector_analysis.items():
+        print(f"  {sector:>18} | n={stats['count']:>4} | mean {stats['mean_score']:>6} | max {stats['max_score']:>5} | tickers {stats['distinct_tickers']}")
     
     return sector_analysis
 
@@ -83,20 +93,25 @@ def execute_enhanced_trade(row):
         send_to_webhook(trade_data)
         return trade_data
     else:
-        if score >= real_threshold:
+        fired = trade_triggers.evaluate(row.to_dict())
+        if fired:
             order = place_equity_order(ticker, qty)
             if order:
                 trade_data['alpaca_order_id'] = order.id
+                trade_data['triggers'] = [rule.rule_id for rule in fired]
                 log_to_supabase(trade_data)
                 send_to_webhook(trade_data)
                 return trade_data
         else:
-            print(f"⏸️ Signal {ticker} below threshold (Score: {score} < {real_threshold})")
+            print(f"⏸️ Signal {ticker} matched no trade trigger (Score: {score}, threshold {real_threshold})")
     
     return None
 
 # === EXECUTE EQUITY ORDER ===
 def place_equity_order(symbol, qty=1):
+    if replaying:
+        print(f"⏪ REPLAY - Would place order: {symbol} x{qty}")
+        return None
     try:
         order = alpaca.submit_order(
             symbol=symbol,
@@ -113,6 +128,8 @@ def place_equity_order(symbol, qty=1):
 
 # === SEND TO N8N ===
 def send_to_webhook(trade):
+    if replaying:
+        return
     if not N8N_WEBHOOK_URL:
         print("⚠️ No webhook URL configured")
         return
@@ -125,6 +142,8 @@ def send_to_webhook(trade):
 
 # === LOG TO SUPABASE ===
 def log_to_supabase(trade_data: dict):
+    if replaying:
+        return
     if not SUPABASE_URL or not SUPABASE_KEY:
         print("⚠️ Supabase not configured")
         return
@@ -140,6 +159,8 @@ def run_signal_sniper():
     """Main execution function"""
     print("🎯 Signal Sniper v2.0 Starting...")
     print(f"🧪 Test Mode: {test_mode}")
+    if replaying:
+        print("⏪ Replay mode: orders, Supabase and webhooks are skipped")
     print(f"🎚️ Threshold: {real_threshold}")
     
     # Run all scrapers
@@ -158,7 +179,7 @@ def run_signal_sniper():
         return
     
     # Analyze sector trends
-    analyze_sector_trends(df_filtered)
+    analyze_sector_trends()
     
     # Display top signals
     print(f"\n🏆 Top 10 Signals:")
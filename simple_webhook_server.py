@@ -0,0 +1,128 @@
+import os
+import io
+import gzip
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Signal feed endpoint for the Streamlit dashboard.
+# GET /render-feed returns the Supabase `signals` table. Clients that send
+# `Accept: application/vnd.apache.arrow.stream` get a compressed Arrow IPC
+# stream with a typed UTC timestamp column; everyone else gets (gzipped) JSON.
+# GET /sector-stats returns the rolling sector / signal_type stats that the
+# scraper processes record in the shared SQLite file (see sector_stats.py).
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow is optional, JSON always works
+    pa = None
+
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+FEED_PATH = "/render-feed"
+SECTOR_STATS_ROUTE = "/sector-stats"
+FEED_TABLE = os.getenv("FEED_TABLE", "signals")
+FEED_LIMIT = int(os.getenv("FEED_LIMIT", "50000"))
+FEED_HOST = os.getenv("FEED_HOST", "0.0.0.0")
+FEED_PORT = int(os.getenv("FEED_PORT", "8080"))
+PAGE_SIZE = 1000  # Supabase caps rows per request
+
+def load_feed(limit=FEED_LIMIT):
+    """The newest `limit` feed rows, returned oldest first, paged out of Supabase"""
+    from signalsniper import get_supabase
+    table = get_supabase().table(FEED_TABLE)
+    rows = []
+    while len(rows) < limit:
+        end = min(len(rows) + PAGE_SIZE, limit) - 1
+        page = table.select("*").order("timestamp", desc=True).range(len(rows), end).execute().data
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            break
+    rows.reverse()
+    return rows
+
+def accepts_arrow(accept_header: str) -> bool:
+    if pa is None:
+        return False
+    for part in (accept_header or "").split(","):
+        mime, _, params = part.strip().partition(";")
+        if mime.strip().lower() == ARROW_MIME:
+            return "q=0" not in params.replace(" ", "").split(";")
+    return False
+
+def encode_arrow(rows) -> bytes:
+    """Columnar Arrow IPC stream, zstd-compressed, with `timestamp` as timestamp[us, UTC]"""
+    import pandas as pd
+    df = pd.DataFrame(rows)
+    if "timestamp" in df.columns:
+        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True, format="ISO8601", errors="coerce")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = io.BytesIO()
+    options = pa.ipc.IpcWriteOptions(compression="zstd")
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+def encode_json(rows) -> bytes:
+    return json.dumps(rows, default=str).encode("utf-8")
+
+class FeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == SECTOR_STATS_ROUTE:
+            from sector_stats import SECTOR_STATS
+            try:
+                body = json.dumps(SECTOR_STATS.export()).encode("utf-8")
+            except Exception as e:
+                print(f"🔴 Sector stats error: {e}")
+                self.send_error(500, str(e))
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if url.path != FEED_PATH:
+            self.send_error(404)
+            return
+        try:
+            limit = int(parse_qs(url.query).get("limit", [FEED_LIMIT])[0])
+            rows = load_feed(limit)
+        except Exception as e:
+            print(f"🔴 Feed error: {e}")
+            self.send_error(500, str(e))
+            return
+
+        encoding = None
+        body = None
+        if accepts_arrow(self.headers.get("Accept")):
+            try:
+                body, content_type = encode_arrow(rows), ARROW_MIME
+            except (pa.ArrowException, TypeError, ValueError) as e:
+                # Mixed-type object columns (e.g. list-valued `sources`) can't always be typed
+                print(f"⚠️ Arrow encoding failed, falling back to JSON: {e}")
+        if body is None:
+            body, content_type = encode_json(rows), "application/json"
+            # Arrow carries its own compression; JSON gets gzip when the client allows it
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body, encoding = gzip.compress(body, compresslevel=5), "gzip"
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept, Accept-Encoding")
+        self.end_headers()
+        self.wfile.write(body)
+
+def run_server(host=FEED_HOST, port=FEED_PORT):
+    server = ThreadingHTTPServer((host, port), FeedHandler)
+    print(f"📡 Feed serving on http://{host}:{port}{FEED_PATH} (Arrow: {'on' if pa else 'off'})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️ Feed server stopped")
+
+if __name__ == "__main__":
+    run_server()
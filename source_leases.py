@@ -0,0 +1,203 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Lease coordination for worker mode. Several signalsniper processes share one
+# SQLite file; each source is claimed through a lease with a heartbeat, and a
+# source is marked done per scrape interval so it is never scraped twice in
+# the same interval. Leases that stop heartbeating expire and can be taken over.
+# Each worker stages its scored signals per interval; once every source is done
+# one worker fuses the staged rows across sources and publishes them.
+
+DEFAULT_LEASE_DB = os.getenv("SIGNALSNIPER_LEASE_DB", "signalsniper_leases.db")
+DEFAULT_LEASE_TTL = 30  # Seconds a lease survives without a heartbeat
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS source_leases (
+    source     TEXT PRIMARY KEY,
+    owner      TEXT,
+    expires_at REAL NOT NULL DEFAULT 0,
+    slot       INTEGER NOT NULL DEFAULT -1,
+    done_slot  INTEGER NOT NULL DEFAULT -1
+)
+"""
+STAGING_SCHEMA = """
+CREATE TABLE IF NOT EXISTS staged_signals (
+    slot    INTEGER NOT NULL,
+    source  TEXT NOT NULL,
+    signals TEXT NOT NULL,
+    PRIMARY KEY (slot, source)
+)
+"""
+
+class LeaseLost(Exception):
+    """Raised when another worker took over a lease we were still using"""
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+def current_slot(interval: float, now: float = None) -> int:
+    """Index of the scrape interval `now` falls into"""
+    now = time.time() if now is None else now
+    return int(now // interval)
+
+class LeaseStore:
+    """SQLite-backed source leases shared by all workers"""
+
+    def __init__(self, path=DEFAULT_LEASE_DB, worker_id=None, ttl=DEFAULT_LEASE_TTL):
+        self.path = path
+        self.worker_id = worker_id or default_worker_id()
+        self.ttl = ttl
+        self._local = threading.local()
+        with self._transaction() as conn:
+            conn.execute(SCHEMA)
+            conn.execute(STAGING_SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode; transactions are opened explicitly below
+            conn = sqlite3.connect(self.path, timeout=self.ttl, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        # IMMEDIATE takes the write lock up front so read-then-update is atomic
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def claim(self, source: str, slot: int, now: float = None) -> bool:
+        """Try to take the lease on `source` for interval `slot`"""
+        now = time.time() if now is None else now
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT owner, expires_at, done_slot FROM source_leases WHERE source = ?",
+                (source,),
+            ).fetchone()
+            if row is None:
+                conn.execute(
+                    "INSERT INTO source_leases (source, owner, expires_at, slot) VALUES (?, ?, ?, ?)",
+                    (source, self.worker_id, now + self.ttl, slot),
+                )
+                return True
+            owner, expires_at, done_slot = row
+            if done_slot >= slot:
+                return False  # Already scraped this interval
+            if owner and owner != self.worker_id and expires_at > now:
+                return False  # Held by a live worker
+            conn.execute(
+                "UPDATE source_leases SET owner = ?, expires_at = ?, slot = ? WHERE source = ?",
+                (self.worker_id, now + self.ttl, slot, source),
+            )
+            return True
+
+    def renew(self, source: str, now: float = None) -> bool:
+        """Extend our lease on `source`; False if it was lost to another worker"""
+        now = time.time() if now is None else now
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE source_leases SET expires_at = ? WHERE source = ? AND owner = ?",
+                (now + self.ttl, source, self.worker_id),
+            )
+            return cur.rowcount == 1
+
+    def complete(self, source: str, slot: int, staged=None) -> bool:
+        """Mark `source` scraped for `slot` and drop our lease.
+
+        The slot is marked done even if the lease was lost, so no later claim
+        re-scrapes it; returns False in that case since another worker may
+        already be scraping the same interval. `staged` signal records are
+        kept for the slot's fusion step in the same transaction.
+        """
+        with self._transaction() as conn:
+            if staged is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO staged_signals (slot, source, signals) VALUES (?, ?, ?)",
+                    (slot, source, json.dumps(staged, default=str)),
+                )
+            conn.execute(
+                "UPDATE source_leases SET done_slot = MAX(done_slot, ?) WHERE source = ?",
+                (slot, source),
+            )
+            cur = conn.execute(
+                "UPDATE source_leases SET owner = NULL, expires_at = 0 WHERE source = ? AND owner = ?",
+                (source, self.worker_id),
+            )
+            return cur.rowcount == 1
+
+    def release(self, source: str) -> bool:
+        """Drop the lease without marking the interval done (so it can be retried)"""
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE source_leases SET owner = NULL, expires_at = 0 WHERE source = ? AND owner = ?",
+                (source, self.worker_id),
+            )
+            return cur.rowcount == 1
+
+    def pending_sources(self, sources, slot: int, live_only=False, now: float = None) -> list:
+        """Sources not yet done for `slot`; with `live_only`, just those a live worker is still scraping"""
+        now = time.time() if now is None else now
+        rows = {
+            source: (owner, expires_at, lease_slot, done_slot)
+            for source, owner, expires_at, lease_slot, done_slot in self._connect().execute(
+                "SELECT source, owner, expires_at, slot, done_slot FROM source_leases"
+            )
+        }
+        pending = []
+        for source in sources:
+            owner, expires_at, lease_slot, done_slot = rows.get(source, (None, 0, -1, -1))
+            if done_slot >= slot:
+                continue
+            if live_only and not (owner and expires_at > now and lease_slot == slot):
+                continue
+            pending.append(source)
+        return pending
+
+    def staged(self, slot: int) -> list:
+        """Every signal record staged for `slot`, across sources"""
+        rows = self._connect().execute("SELECT signals FROM staged_signals WHERE slot = ?", (slot,))
+        return [signal for (body,) in rows for signal in json.loads(body)]
+
+    def clear_staged(self, slot: int):
+        """Drop staged signals for `slot` and anything older"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM staged_signals WHERE slot <= ?", (slot,))
+
+    @contextmanager
+    def heartbeat(self, source: str):
+        """Keep renewing the lease on `source` in the background while the block runs.
+
+        Yields an Event that is set once the lease is lost; callers must check
+        it before doing anything visible (publishing) with the scrape.
+        """
+        stop = threading.Event()
+        lost = threading.Event()
+
+        def beat():
+            while not stop.wait(self.ttl / 3):
+                try:
+                    if not self.renew(source):
+                        print(f"⚠️ Lost lease on {source}")
+                        lost.set()
+                        return
+                except sqlite3.Error as e:
+                    print(f"⚠️ Heartbeat error for {source}: {e}")
+
+        thread = threading.Thread(target=beat, name=f"lease-{source}", daemon=True)
+        thread.start()
+        try:
+            yield lost
+        finally:
+            stop.set()
+            thread.join()
@@ -0,0 +1,196 @@
+import re
+import math
+import itertools
+from bisect import bisect_left, bisect_right
+
+# Indexed trigger engine for score / price alert rules.
+# Rules are bucketed by (ticker or "*", field, first equality predicate) and
+# kept in sorted threshold lists per comparison direction, so an incoming signal
+# or quote is matched by bisecting into the few lists that can apply instead of
+# scanning every rule.
+#
+#   engine = TriggerEngine()
+#   engine.add(parse_rule("score >= 80 and sector = biotech"))
+#   engine.add(parse_rule("TSLA price crosses above 270"))
+#   for rule in engine.evaluate({"ticker": "TSLA", "price": 271.5}): ...
+
+FIELD_ALIASES = {"score": "signal_score"}
+OPS = (">=", ">", "<=", "<", "crosses_above", "crosses_below")
+
+class Rule:
+    __slots__ = ("rule_id", "field", "op", "threshold", "ticker", "where", "action")
+
+    def __init__(self, field, op, threshold, ticker=None, where=None, action=None, rule_id=None):
+        if op not in OPS:
+            raise ValueError(f"Unknown operator {op!r}, expected one of {OPS}")
+        self.rule_id = rule_id
+        self.field = FIELD_ALIASES.get(field, field)
+        self.op = op
+        self.threshold = float(threshold)
+        self.ticker = ticker.upper() if ticker else None
+        self.where = {FIELD_ALIASES.get(k, k): str(v).lower() for k, v in (where or {}).items()}
+        self.action = action
+
+    def facet(self):
+        """The equality predicate the rule is indexed under, if any"""
+        return min(self.where.items()) if self.where else None
+
+    def matches_where(self, event) -> bool:
+        for key, expected in self.where.items():
+            if str(event.get(key, "")).lower() != expected:
+                return False
+        return True
+
+    def __repr__(self):
+        scope = self.ticker or "*"
+        extra = "".join(f" and {k} = {v}" for k, v in self.where.items())
+        return f"Rule({self.rule_id}: {scope} {self.field} {self.op} {self.threshold:g}{extra})"
+
+RULE_PATTERN = re.compile(
+    r"^\s*(?:(?P<ticker>[A-Z]{1,5})\s+)?(?P<field>\w+)\s*"
+    r"(?P<op>>=|<=|>|<|crosses\s+above|crosses\s+below|crosses)\s*(?P<value>-?\d+(?:\.\d+)?)"
+    r"(?P<rest>(?:\s+and\s+\w+\s*==?\s*[\w/.-]+)*)\s*$",
+    re.IGNORECASE,
+)
+WHERE_PATTERN = re.compile(r"and\s+(\w+)\s*==?\s*([\w/.-]+)", re.IGNORECASE)
+
+def parse_rule(text: str, rule_id=None, action=None) -> Rule:
+    """Build a Rule from e.g. "score >= 80 and sector = biotech" or "TSLA price crosses above 270" """
+    m = RULE_PATTERN.match(text)
+    if not m:
+        raise ValueError(f"Can't parse trigger rule: {text!r}")
+    op = " ".join(m.group("op").lower().split())
+    op = {"crosses above": "crosses_above", "crosses": "crosses_above", "crosses below": "crosses_below"}.get(op, op)
+    where = dict(WHERE_PATTERN.findall(m.group("rest") or ""))
+    return Rule(m.group("field").lower(), op, m.group("value"), m.group("ticker"), where, action, rule_id)
+
+class _SortedRules:
+    """Rules sorted by threshold, with a parallel key list for bisect"""
+    __slots__ = ("keys", "rules")
+
+    def __init__(self):
+        self.keys = []
+        self.rules = []
+
+    def add(self, rule: Rule):
+        i = bisect_right(self.keys, rule.threshold)
+        self.keys.insert(i, rule.threshold)
+        self.rules.insert(i, rule)
+
+    def remove(self, rule: Rule):
+        i = bisect_left(self.keys, rule.threshold)
+        while i < len(self.keys) and self.keys[i] == rule.threshold:
+            if self.rules[i] is rule:
+                del self.keys[i]
+                del self.rules[i]
+                return
+            i += 1
+
+    def __len__(self):
+        return len(self.keys)
+
+class _FieldIndex:
+    """All rules on one (ticker, field), split by comparison direction"""
+    __slots__ = ("above", "below", "cross_up", "cross_down")
+
+    def __init__(self):
+        self.above = _SortedRules()       # >=, >   : fire when value >= threshold
+        self.below = _SortedRules()       # <=, <   : fire when value <= threshold
+        self.cross_up = _SortedRules()    # prev < threshold <= value
+        self.cross_down = _SortedRules()  # prev > threshold >= value
+
+    def bucket(self, op: str) -> _SortedRules:
+        if op in (">=", ">"):
+            return self.above
+        if op in ("<=", "<"):
+            return self.below
+        return self.cross_up if op == "crosses_above" else self.cross_down
+
+    def match(self, value: float, prev: float, out: list):
+        above = self.above
+        for i in range(bisect_right(above.keys, value)):
+            rule = above.rules[i]
+            if rule.op == ">=" or value > rule.threshold:
+                out.append(rule)
+        below = self.below
+        for i in range(bisect_left(below.keys, value), len(below.keys)):
+            rule = below.rules[i]
+            if rule.op == "<=" or value < rule.threshold:
+                out.append(rule)
+        if prev is None or prev == value:
+            return
+        if value > prev:
+            up = self.cross_up
+            out.extend(up.rules[bisect_right(up.keys, prev):bisect_right(up.keys, value)])
+        else:
+            down = self.cross_down
+            out.extend(down.rules[bisect_left(down.keys, value):bisect_left(down.keys, prev)])
+
+class TriggerEngine:
+    def __init__(self):
+        self._index = {}         # (ticker or "*", field, facet) -> _FieldIndex
+        self._rules = {}         # rule_id -> Rule
+        self._fields = {}        # field -> number of rules on it
+        self._facet_fields = {}  # predicate field -> number of rules indexed under it
+        self._last = {}          # (ticker, field) -> last value seen, for crossings
+        self._ids = itertools.count(1)
+
+    def __len__(self):
+        return len(self._rules)
+
+    @staticmethod
+    def _key(rule: Rule):
+        return (rule.ticker or "*", rule.field, rule.facet())
+
+    def add(self, rule: Rule):
+        if rule.rule_id is None:
+            rule.rule_id = f"rule-{next(self._ids)}"
+        if rule.rule_id in self._rules:
+            self.remove(rule.rule_id)
+        key = self._key(rule)
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = _FieldIndex()
+        index.bucket(rule.op).add(rule)
+        self._rules[rule.rule_id] = rule
+        self._fields[rule.field] = self._fields.get(rule.field, 0) + 1
+        if key[2]:
+            self._facet_fields[key[2][0]] = self._facet_fields.get(key[2][0], 0) + 1
+        return rule.rule_id
+
+    def remove(self, rule_id) -> bool:
+        rule = self._rules.pop(rule_id, None)
+        if rule is None:
+            return False
+        key = self._key(rule)
+        self._index[key].bucket(rule.op).remove(rule)
+        for counts, name in ((self._fields, rule.field), (self._facet_fields, key[2] and key[2][0])):
+            if name:
+                counts[name] -= 1
+                if not counts[name]:
+                    del counts[name]
+        return True
+
+    def evaluate(self, event) -> list:
+        """Rules fired by one signal / quote (any mapping with a `ticker`)"""
+        ticker = str(event.get("ticker", "")).upper()
+        facets = [None] + [(name, str(event.get(name, "")).lower()) for name in self._facet_fields]
+        candidates = []
+        for field in self._fields:
+            value = event.get(field)
+            if value is None or isinstance(value, bool):
+                continue
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            if not math.isfinite(value):
+                continue  # NaN would bisect past every threshold and fire everything
+            prev = self._last.get((ticker, field))
+            self._last[(ticker, field)] = value
+            for scope in (ticker, "*"):
+                for facet in facets:
+                    index = self._index.get((scope, field, facet))
+                    if index is not None:
+                        index.match(value, prev, candidates)
+        return [rule for rule in candidates if len(rule.where) < 2 or rule.matches_where(event)]